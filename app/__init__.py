@@ -1,18 +1,45 @@
 import os
+import sqlite3
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool, StaticPool
 
 # Khởi tạo các extension mà không gắn với app cụ thể.
 # Chúng sẽ được gắn với app trong hàm factory create_app.
 db = SQLAlchemy()
 ma = Marshmallow()
 
+@event.listens_for(Engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tinh chỉnh SQLite cho môi trường dev/test ngay khi mở kết nối.
+    - journal_mode=WAL: reader không bị writer chặn, commit không ghi đè journal.
+    - synchronous=NORMAL: bỏ một lần fsync mỗi transaction (an toàn khi dùng WAL).
+    - temp_store=MEMORY, mmap_size, cache_size: giảm I/O cho truy vấn thường gặp.
+    Với database :memory: các pragma này vô hại (WAL tự bỏ qua).
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.close()
+
 class Config:
     """
     Lớp cấu hình cơ bản cho ứng dụng Flask.
     Chứa các biến cấu hình chung cho ứng dụng.
+
+    Các lớp cấu hình không bao giờ được khởi tạo instance: from_object đọc
+    thẳng thuộc tính lớp, nên __slots__ rỗng để chặn __dict__ per-instance
+    và giữ mọi giá trị là hằng ở mức lớp.
     """
+    __slots__ = ()
     # Cấu hình cơ sở dữ liệu SQLite.
     # Ưu tiên biến môi trường DATABASE_URL (ví dụ cho Heroku/Docker).
     # Nếu không có, sử dụng SQLite trong thư mục 'app' của dự án.
@@ -20,22 +47,132 @@ class Config:
                               'sqlite:///' + os.path.join(os.path.abspath(os.path.dirname(__file__)), 'site.db')
     # Tắt tính năng theo dõi thay đổi của SQLAlchemy để tiết kiệm tài nguyên và tránh cảnh báo.
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Cấu hình connection pool tường minh thay vì dựa vào mặc định của Flask-SQLAlchemy.
+    # Mỗi kết nối mới tốn một lần bắt tay TCP + xác thực (và ~1.3MB bộ nhớ phía server),
+    # nên giữ sẵn pool giúp loại bỏ chi phí kết nối trên mỗi request.
+    # - pool_pre_ping: kiểm tra kết nối còn sống trước khi dùng, tránh lỗi do kết nối chết.
+    # - pool_recycle: tái tạo kết nối cũ hơn 30 phút để né timeout phía server/firewall.
+    # - pool_use_lifo: ưu tiên kết nối vừa dùng (cache ấm hơn, kết nối thừa tự hết hạn).
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "pool_use_lifo": True,
+        # Nới cache câu lệnh đã biên dịch (mặc định 500): với app CRUD đơn giản
+        # thì mọi câu lệnh đều nằm gọn trong cache, không bao giờ phải biên dịch lại.
+        "query_cache_size": 1200,
+    }
+    # Dùng validator chuyên biệt trong app.schemas_fast thay cho load() của
+    # Marshmallow trên các endpoint ghi. Tắt cờ này để quay lại Marshmallow
+    # (ví dụ khi schema thay đổi mà validator tay chưa theo kịp).
+    FAST_VALIDATION = True
     # Có thể thêm các cấu hình khác ở đây, ví dụ: SECRET_KEY, DEBUG, v.v.
     # SECRET_KEY = os.environ.get('SECRET_KEY') or 'a_very_secret_key_for_dev'
 
-def create_app(config_class=Config):
+    @classmethod
+    def init_app(cls, app):
+        """
+        Điểm móc cho side effect khởi tạo theo môi trường (tạo thư mục log,
+        cấu hình logging, kiểm tra biến môi trường bắt buộc...). Gọi đúng một
+        lần từ create_app — tức là SAU khi gunicorn fork worker — thay vì đặt
+        ở thân lớp, nơi mọi `import app` (kể cả trong test) đều chạy lại.
+        Lớp cơ sở không có side effect nào; các lớp con override khi cần.
+        """
+
+class TestingConfig(Config):
+    """
+    Cấu hình cho môi trường kiểm thử.
+    Dùng SQLite in-memory; StaticPool chia sẻ đúng một kết nối cho mọi thread
+    để tất cả cùng thấy một database trong bộ nhớ.
+    """
+    __slots__ = ()
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "poolclass": StaticPool,
+        "connect_args": {"check_same_thread": False},
+        "query_cache_size": 1200,
+    }
+
+class ProductionConfig(Config):
+    """
+    Cấu hình cho môi trường production.
+    Nếu database được đặt sau pgbouncer ở transaction mode thì pooling phía
+    ứng dụng là thừa (double-pooling) — khi đó đặt biến môi trường
+    SQLALCHEMY_POOL_DISABLED để chuyển sang NullPool và để pgbouncer quản lý.
+    """
+    __slots__ = ()
+    if os.environ.get('SQLALCHEMY_POOL_DISABLED'):
+        SQLALCHEMY_ENGINE_OPTIONS = {"poolclass": NullPool}
+    else:
+        SQLALCHEMY_ENGINE_OPTIONS = dict(Config.SQLALCHEMY_ENGINE_OPTIONS, pool_size=50)
+
+    @classmethod
+    def init_app(cls, app):
+        # Production không được chạy trên SQLite mặc định của dev; kiểm tra
+        # ở đây (sau fork) thay vì lúc import để test import được module này.
+        if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite:'):
+            app.logger.warning(
+                'Production đang dùng SQLite — hãy đặt DATABASE_URL trỏ tới database thật.')
+
+# Bảng chọn cấu hình theo biến môi trường APP_ENV.
+# Trả về chính lớp cấu hình (không khởi tạo instance): from_object của Flask
+# đọc thuộc tính lớp trực tiếp, nên không cần tốn một object trung gian.
+_CONFIGS = {
+    'development': Config,
+    'testing': TestingConfig,
+    'production': ProductionConfig,
+}
+
+def get_config():
+    """
+    Chọn lớp cấu hình dựa trên biến môi trường APP_ENV.
+    Mặc định (hoặc khi giá trị không hợp lệ) là cấu hình development.
+    """
+    return _CONFIGS.get(os.environ.get('APP_ENV', 'development').lower(), Config)
+
+def _warm_statement_cache(app):
+    """
+    Thực thi trước các câu lệnh "nóng" (GET theo id, GET danh sách) để đưa
+    bản biên dịch của chúng vào compiled cache của engine ngay lúc khởi động.
+    Nhờ đó request đầu tiên không phải trả chi phí biên dịch Core -> SQL.
+    Bảng có thể chưa tồn tại ở thời điểm này — không sao: câu lệnh đã được
+    biên dịch và cache TRƯỚC khi database báo lỗi, nên chỉ cần rollback.
+    """
+    from sqlalchemy import bindparam, select
+    from app.models import Todo
+
+    warm_stmts = [
+        (select(Todo).where(Todo.id == bindparam('id')), {"id": 0}),
+        (select(Todo.id, Todo.title, Todo.description,
+                Todo.completed, Todo.created_at, Todo.updated_at)
+            .order_by(Todo.id).limit(bindparam('lim')), {"lim": 1}),
+    ]
+    with app.app_context():
+        for stmt, params in warm_stmts:
+            try:
+                db.session.execute(stmt, params).close()
+            except Exception:
+                db.session.rollback()
+
+def create_app(config_class=None):
     """
     Hàm factory để tạo và cấu hình ứng dụng Flask.
     Sử dụng pattern factory giúp dễ dàng kiểm thử và quản lý các môi trường khác nhau.
 
     Args:
-        config_class: Lớp cấu hình để sử dụng cho ứng dụng (mặc định là Config).
+        config_class: Lớp cấu hình để sử dụng cho ứng dụng.
+                      Mặc định chọn theo APP_ENV qua get_config().
 
     Returns:
         Một đối tượng ứng dụng Flask đã được cấu hình.
     """
     app = Flask(__name__)
 
+    if config_class is None:
+        config_class = get_config()
+
     try:
         # Tải cấu hình từ lớp Config đã cung cấp.
         app.config.from_object(config_class)
@@ -45,10 +182,18 @@ def create_app(config_class=Config):
         print(f"Lỗi khi tải cấu hình ứng dụng: {e}")
         raise # Ném lại lỗi để dừng ứng dụng nếu cấu hình không thành công
 
+    # Side effect khởi tạo theo môi trường — chạy một lần ở đây (sau fork)
+    # thay vì ở thân lớp cấu hình lúc import.
+    config_class.init_app(app)
+
     # Gắn các extension đã khởi tạo vào đối tượng ứng dụng Flask.
     db.init_app(app)
     ma.init_app(app)
 
+    # Làm ấm cache câu lệnh đã biên dịch để request đầu tiên không phải
+    # trả chi phí biên dịch SQL.
+    _warm_statement_cache(app)
+
     # Đăng ký Blueprint (nếu có).
     # Trong một ứng dụng lớn hơn, các routes API sẽ được định nghĩa trong các Blueprint riêng biệt.
     # Ví dụ:
@@ -1,5 +1,64 @@
 from datetime import datetime
-from app import db, ma
+from operator import attrgetter
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash, check_password_hash
+from app import db
+
+try:
+    # Ưu tiên argon2 (cài đặt C): nhanh hơn đáng kể so với pbkdf2:sha256
+    # 600k vòng lặp mặc định của werkzeug ở cùng mức an toàn, nên giảm hẳn
+    # CPU trên các endpoint xác thực. Tham số theo khuyến nghị OWASP.
+    from argon2 import PasswordHasher
+    from argon2.exceptions import VerifyMismatchError, InvalidHashError
+    _password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+except ImportError:
+    _password_hasher = None
+
+# Định nghĩa SQLAlchemy Model cho đối tượng User (chủ sở hữu các công việc)
+class User(db.Model):
+    __tablename__ = 'users'
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(64), unique=True, nullable=False, index=True)
+    email = db.Column(db.String(128), unique=True, nullable=False, index=True)
+    password_hash = db.Column(db.String(255), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Quan hệ 1-n với Todo. Cố ý KHÔNG dùng lazy='dynamic': dynamic biến mỗi
+    # lần truy cập thuộc tính thành một câu SQL mới (nguồn N+1 kinh điển).
+    # Giữ lazy mặc định ('select') và khi cần duyệt quan hệ trong danh sách,
+    # eager-load tường minh tại điểm truy vấn, ví dụ:
+    #   select(Todo).options(selectinload(Todo.user), raiseload('*'))
+    # selectinload gom các lazy-load lẻ thành một câu WHERE user_id IN (...),
+    # còn raiseload('*') làm lộ ngay mọi lazy-load vô tình thay vì âm thầm N+1.
+    todos = db.relationship('Todo', back_populates='user',
+                            cascade='all, delete-orphan')
+
+    def __repr__(self):
+        return f'<User {self.id}: {self.username}>'
+
+    @property
+    def password(self):
+        # Không cho phép đọc trực tiếp mật khẩu
+        raise AttributeError('password không phải là thuộc tính đọc được')
+
+    @password.setter
+    def password(self, password):
+        if _password_hasher is not None:
+            self.password_hash = _password_hasher.hash(password)
+        else:
+            # Fallback khi thiếu argon2-cffi
+            self.password_hash = generate_password_hash(password)
+
+    def verify_password(self, password):
+        if _password_hasher is not None and self.password_hash.startswith('$argon2'):
+            try:
+                return _password_hasher.verify(self.password_hash, password)
+            except (VerifyMismatchError, InvalidHashError):
+                return False
+        # Hash cũ kiểu werkzeug (hoặc không có argon2): giữ tương thích ngược,
+        # có thể migrate dần sang argon2 ở lần đăng nhập thành công kế tiếp
+        return check_password_hash(self.password_hash, password)
+
 
 # Định nghĩa SQLAlchemy Model cho đối tượng Todo
 class Todo(db.Model):
@@ -9,7 +68,29 @@ class Todo(db.Model):
     description = db.Column(db.String(255), nullable=True)
     completed = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # index=True: phục vụ ETag cho danh sách (MAX(updated_at)) và sort theo thời gian cập nhật
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    # Chủ sở hữu công việc; nullable để tương thích với dữ liệu cũ chưa gắn user.
+    # Không đặt index=True riêng: cột này đã là cột dẫn đầu của composite index
+    # bên dưới, thêm index đơn chỉ tốn thêm chi phí ghi trên INSERT/UPDATE.
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    user = db.relationship('User', back_populates='todos')
+
+    # Composite index khớp truy vấn danh sách điển hình:
+    # WHERE user_id = ? AND completed = ? ORDER BY updated_at.
+    # Trên Postgres, INCLUDE title biến truy vấn danh sách theo user thành
+    # index-only scan (không cần đọc heap); các dialect khác bỏ qua tùy chọn này.
+    __table_args__ = (
+        db.Index('ix_todos_user_completed_updated',
+                 'user_id', 'completed', 'updated_at',
+                 postgresql_include=['title']),
+        # Phục vụ truy vấn "việc chưa xong, mới cập nhật trước" không lọc
+        # theo user (WHERE completed = ? ORDER BY updated_at): composite này
+        # cho planner đi thẳng index thay vì ghép hai index đơn bằng bitmap
+        # scan. Index trên (user_id, ...) phía trên không dùng được vì
+        # completed không phải cột dẫn đầu của nó.
+        db.Index('ix_todos_completed_updated', 'completed', 'updated_at'),
+    )
 
     def __init__(self, title, description=None, completed=False):
         self.title = title
@@ -19,6 +100,40 @@ class Todo(db.Model):
     def __repr__(self):
         return f'<Todo {self.id}: {self.title}>'
 
+    # Khóa và getter cho to_dict, giải sẵn một lần ở mức lớp: attrgetter
+    # nhiều tên đọc cả 6 thuộc tính trong một lời gọi C, khỏi tra tên
+    # thuộc tính từng cái trong bytecode của mỗi lần to_dict
+    _TO_DICT_KEYS = ('id', 'title', 'description', 'completed',
+                     'created_at', 'updated_at')
+    _TO_DICT_GET = attrgetter(*_TO_DICT_KEYS)
+
+    def to_dict(self):
+        """
+        Serializer viết tay cho đường đọc: zip khóa đã cố định với tuple
+        giá trị do attrgetter trả về, không qua vòng lặp field của
+        Marshmallow. Trả datetime thô — orjson encode datetime ở tầng C,
+        nên không cần isoformat()/strftime() từng trường ở Python.
+        """
+        return dict(zip(self._TO_DICT_KEYS, self._TO_DICT_GET(self)))
+
+    # Tạo nhiều Todo trong một câu INSERT executemany duy nhất
+    @classmethod
+    def bulk_create(cls, rows):
+        """
+        Ghi một danh sách dict (đã validate, cùng tập khóa) bằng một câu
+        INSERT executemany trong một transaction — một round-trip tới
+        database thay vì N lần save() commit từng dòng. Bỏ qua bộ máy
+        unit-of-work của ORM nên không có instance nào được dựng.
+        Trả về số dòng đã ghi.
+        """
+        if not rows:
+            # execute(insert, []) không phải no-op: SQLAlchemy coi đó là
+            # INSERT một dòng chỉ gồm giá trị default
+            return 0
+        db.session.execute(insert(cls), rows)
+        db.session.commit()
+        return len(rows)
+
     # Phương thức để lưu một đối tượng Todo vào cơ sở dữ liệu
     def save(self):
         try:
@@ -49,23 +164,3 @@ class Todo(db.Model):
         except Exception as e:
             db.session.rollback()
             raise Exception(f"Lỗi khi cập nhật Todo: {e}")
-
-
-# Định nghĩa Marshmallow Schema cho đối tượng Todo
-# Schema này dùng để serialize (chuyển đổi từ object Python sang JSON) và deserialize (từ JSON sang object Python)
-class TodoSchema(ma.SQLAlchemyAutoSchema):
-    class Meta:
-        model = Todo
-        # Sử dụng db.session để Marshmallow có thể tương tác với SQLAlchemy
-        load_instance = True  # Cho phép load dữ liệu vào một instance của model
-        sqla_session = db.session
-        # Các trường sẽ được hiển thị trong JSON
-        fields = ('id', 'title', 'description', 'completed', 'created_at', 'updated_at')
-
-    # Thêm validation cho trường 'title' để đảm bảo nó không rỗng
-    # (Mặc dù nullable=False trong model đã xử lý ở mức DB, đây là validation ở mức ứng dụng)
-    title = ma.fields.String(required=True, error_messages={"required": "Trường 'title' là bắt buộc."})
-
-# Khởi tạo các instance của Schema để sử dụng dễ dàng
-todo_schema = TodoSchema()
-todos_schema = TodoSchema(many=True) # Dùng cho danh sách các Todo
@@ -1,50 +1,248 @@
-from flask import Blueprint, request, jsonify
+import orjson
+from flask import Blueprint, request, current_app, abort, stream_with_context
 from marshmallow import ValidationError
+from sqlalchemy import select, update, delete, func, or_
+from sqlalchemy.exc import SQLAlchemyError
 from app.models import db, Todo # Giả định db và Todo model được định nghĩa trong app.models
-from app.schemas import TodoSchema # Giả định TodoSchema được định nghĩa trong app.schemas
+# Dùng chung một bộ instance schema duy nhất từ app.schemas: mỗi lần khởi tạo
+# Schema là một lần Marshmallow bind lại toàn bộ field, nên không lặp lại ở đây
+from app.schemas import todo_schema, todos_schema, todo_schema_partial
+from app.schemas_fast import (msgspec, validate_todo_payload, validate_todo_payloads,
+                              decode_todo_payload, decode_todo_payloads)
 
 # Tạo một Blueprint cho các API routes
 bp = Blueprint('api', __name__, url_prefix='/api')
 
-# Khởi tạo schema cho một đối tượng Todo và một danh sách các đối tượng Todo
-todo_schema = TodoSchema()
-todos_schema = TodoSchema(many=True)
+def json_response(payload, status=200):
+    """
+    Tạo phản hồi JSON bằng orjson thay cho flask.jsonify.
+    orjson serialize ở tầng C (nhanh hơn json chuẩn 5-10 lần) và hỗ trợ
+    datetime trực tiếp, không cần strftime thủ công khi dump.
+    """
+    return current_app.response_class(
+        # OPT_NON_STR_KEYS: lỗi validation dạng many=True dùng chỉ số int làm khóa
+        orjson.dumps(payload,
+                     option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS),
+        status=status,
+        mimetype="application/json",
+    )
+
+# --- Xử lý lỗi tập trung cho Blueprint ---
+# Thay cho try/except Exception bọc quanh từng route: mỗi handler giờ là mã
+# phẳng (ít opcode hơn trên đường thành công), còn rollback và định dạng lỗi
+# gom về một chỗ duy nhất.
+
+@bp.errorhandler(ValidationError)
+def handle_validation_error(err):
+    """
+    Lỗi validation -> 400 kèm chi tiết từng trường.
+    Không rollback ở đây: validate luôn thất bại TRƯỚC khi chạm database,
+    session còn sạch, mà rollback trên session sạch vẫn đi qua bộ máy
+    transaction của SQLAlchemy — phí vô ích trên đường 4xx.
+    """
+    return json_response({"message": "Dữ liệu đầu vào không hợp lệ", "errors": err.messages}, 400)
+
+@bp.errorhandler(SQLAlchemyError)
+def handle_sqlalchemy_error(err):
+    """Lỗi từ tầng cơ sở dữ liệu -> rollback rồi trả 500, ghi log chi tiết."""
+    # Chỉ rollback khi session còn active. Không gọi in_transaction() qua
+    # db.session: scoped_session không chuyển tiếp phương thức này nên sẽ
+    # ném AttributeError ngay trong error handler.
+    if db.session.is_active:
+        db.session.rollback()
+    current_app.logger.error("Lỗi cơ sở dữ liệu: %s", err, exc_info=True)
+    return json_response({"message": "Lỗi máy chủ nội bộ, vui lòng thử lại sau"}, 500)
+
+@bp.errorhandler(404)
+def handle_not_found(err):
+    """abort(404) trong các route -> phản hồi JSON thống nhất."""
+    return json_response({"message": "Không tìm thấy công việc"}, 404)
+
+@bp.errorhandler(400)
+def handle_bad_request(err):
+    """abort(400) hoặc body JSON hỏng -> phản hồi JSON thống nhất."""
+    return json_response({"message": err.description or "Yêu cầu không hợp lệ"}, 400)
+
+def get_json_or_400():
+    """
+    Đọc body JSON; trả 400 với thông báo thống nhất khi body trống/hỏng.
+    Parse bằng orjson thay cho request.get_json (json chuẩn của Python):
+    cùng parser Rust/C với chiều response, và cache=False để Flask khỏi
+    giữ thêm một bản sao body thô trong request.
+    """
+    body = request.get_data(cache=False)
+    if not body:
+        abort(400, description="Dữ liệu JSON không được cung cấp")
+    try:
+        json_data = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        abort(400, description="Dữ liệu JSON không hợp lệ")
+    if not json_data:
+        abort(400, description="Dữ liệu JSON không được cung cấp")
+    return json_data
+
+# Tập khóa ghi được của payload Todo, làm frozenset để lọc trước khi đưa
+# vào Marshmallow: mỗi khóa chỉ tốn một phép dò hash ở tầng C, và load()
+# nhận dict đã sạch nên vòng quét unknown-field của nó không còn gì để làm
+_ALLOWED_TODO_KEYS = frozenset(('title', 'description', 'completed'))
+
+def _filter_allowed(json_data):
+    return {k: json_data[k] for k in _ALLOWED_TODO_KEYS if k in json_data}
+
+def _load_todo_payload(json_data, partial=False):
+    """
+    Validate payload ghi theo cờ cấu hình FAST_VALIDATION: mặc định dùng
+    validator chuyên biệt (app.schemas_fast), tắt cờ để quay lại Marshmallow.
+    Cả hai đường đều ném ValidationError cùng cấu trúc messages.
+    """
+    if current_app.config.get('FAST_VALIDATION', True):
+        return validate_todo_payload(json_data, partial=partial)
+    schema = todo_schema_partial if partial else todo_schema
+    return schema.load(_filter_allowed(json_data) if isinstance(json_data, dict) else json_data)
+
+def _load_todo_payloads(json_data):
+    """Bản many=True của _load_todo_payload, cho endpoint bulk."""
+    if current_app.config.get('FAST_VALIDATION', True):
+        return validate_todo_payloads(json_data)
+    return todos_schema.load(
+        [_filter_allowed(item) if isinstance(item, dict) else item for item in json_data])
+
+# Giới hạn trên cho tham số ?limit= để chặn các request cố kéo toàn bộ bảng
+MAX_PAGE_SIZE = 500
+
+# Khóa của một dòng trong response danh sách, khớp thứ tự cột SELECT bên
+# dưới. Tuple mức module nên các chuỗi khóa được intern + hash đúng một lần;
+# dict(zip(...)) dựng dict qua đường C thay vì bytecode BUILD_MAP từng khóa.
+_ROW_KEYS = ('id', 'title', 'description', 'completed', 'created_at', 'updated_at')
 
 @bp.route('/todos', methods=['GET'])
 def get_todos():
     """
-    Lấy tất cả các công việc (todo items).
-    Trả về danh sách các công việc.
+    Lấy danh sách công việc (todo items) theo trang, dùng keyset pagination.
+
+    Tham số truy vấn:
+    - limit (int, tùy chọn): số lượng tối đa trả về, mặc định 50, tối đa 500.
+    - after_id (int, tùy chọn): chỉ trả các công việc có id lớn hơn giá trị này.
+
+    Trả về {"items": [...], "next_after_id": id} — truyền next_after_id vào
+    after_id của request kế tiếp để lấy trang sau; null nghĩa là hết dữ liệu.
     """
-    try:
-        # Truy vấn tất cả các công việc từ cơ sở dữ liệu
-        all_todos = Todo.query.all()
-        # Serialize danh sách các công việc thành JSON
-        result = todos_schema.dump(all_todos)
-        return jsonify(result), 200
-    except Exception as e:
-        # Xử lý lỗi nếu có vấn đề khi truy vấn cơ sở dữ liệu
-        # Trả về lỗi 500 Internal Server Error
-        return jsonify({"message": f"Lỗi máy chủ nội bộ khi lấy danh sách công việc: {str(e)}"}), 500
+    # Kẹp cả hai đầu: limit <= 0 làm SQLite bỏ qua LIMIT (kéo cả bảng) và
+    # làm phép dò trang rows[-1] bên dưới lỗi khi rows rỗng
+    limit = max(1, min(request.args.get('limit', 50, type=int), MAX_PAGE_SIZE))
+    after = request.args.get('after_id', type=int)
+
+    # ETag cho cả bộ sưu tập: MAX(updated_at) + COUNT(*) là một truy vấn
+    # aggregate duy nhất trên cột có index, rẻ hơn nhiều so với SELECT đầy đủ
+    # + dump. Tham số trang nằm trong ETag vì nội dung trả về phụ thuộc chúng.
+    # Lưu ý: hàng bị XÓA không đẩy MAX(updated_at) lên nhưng làm COUNT đổi,
+    # nên cần cả hai thành phần để ETag không bị "đứng yên" sai.
+    max_updated, total = db.session.execute(
+        select(func.max(Todo.updated_at), func.count(Todo.id))
+    ).one()
+    # isoformat() giữ nguyên microsecond của MAX(updated_at): cắt về giây
+    # nguyên sẽ trả 304 sai cho cập nhật xảy ra trong cùng một giây
+    etag = (f"{after or 0}-{limit}-{total}-"
+            f"{max_updated.isoformat() if max_updated else 0}")
+    if request.if_none_match.contains_weak(etag):
+        # Client đã có đúng trang này: bỏ qua SELECT chính + serialize
+        response = current_app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+
+    # Keyset pagination: WHERE id > :after ORDER BY id LIMIT k dùng index
+    # khóa chính nên chi phí luôn là O(k), không phụ thuộc kích thước bảng
+    # (khác LIMIT/OFFSET phải quét qua các trang trước).
+    # Chỉ SELECT đúng các cột mà schema sẽ dump, thay vì SELECT * qua ORM.
+    stmt = select(Todo.id, Todo.title, Todo.description,
+                  Todo.completed, Todo.created_at, Todo.updated_at) \
+        .order_by(Todo.id).limit(limit)
+    if after is not None:
+        stmt = stmt.where(Todo.id > after)
+    rows = db.session.execute(stmt).all()
+
+    # Ghép khóa đã dựng sẵn với tuple hàng, khớp thứ tự SELECT ở trên: hàng
+    # đã là tuple thuần (không có instance ORM) nên bỏ luôn tầng schema dump;
+    # datetime để thô cho orjson encode ở tầng C
+    result = [dict(zip(_ROW_KEYS, r)) for r in rows]
+    # Còn trang sau khi trả đủ `limit` dòng; trang cuối trả next_after_id=null
+    next_after_id = rows[-1].id if len(rows) == limit else None
+    response = json_response({"items": result, "next_after_id": next_after_id}, 200)
+    response.set_etag(etag, weak=True)
+    return response
+
+@bp.route('/todos/export', methods=['GET'])
+def export_todos():
+    """
+    Xuất toàn bộ danh sách công việc dưới dạng một mảng JSON streaming.
+
+    Khác với GET /todos (phân trang, dùng cho UI), endpoint này dành cho
+    export/đồng bộ: fetch theo lô 500 dòng (yield_per) và ghi từng phần tử
+    JSON ra socket ngay khi có. Bộ nhớ đỉnh là O(lô) thay vì O(N) và byte
+    đầu tiên được gửi trước khi database đọc xong bảng.
+    """
+    stmt = select(Todo.id, Todo.title, Todo.description,
+                  Todo.completed, Todo.created_at, Todo.updated_at) \
+        .order_by(Todo.id).execution_options(yield_per=500)
+
+    def stream():
+        yield b'['
+        first = True
+        result = db.session.execute(stmt)
+        for batch in result.partitions():
+            # Cùng đường serialize với GET /todos: ghép _ROW_KEYS với tuple
+            # hàng, datetime để thô cho orjson — một định dạng timestamp
+            # thống nhất cho mọi endpoint
+            for r in batch:
+                chunk = orjson.dumps(
+                    dict(zip(_ROW_KEYS, r)),
+                    option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
+                if first:
+                    first = False
+                    yield chunk
+                else:
+                    yield b',' + chunk
+        yield b']'
+
+    # stream_with_context giữ request/app context sống trong lúc generator
+    # chạy, để db.session vẫn dùng được giữa các lần yield
+    return current_app.response_class(
+        stream_with_context(stream()), mimetype="application/json")
+
+def _todo_etag(todo):
+    """
+    ETag yếu cho một Todo, suy ra từ id + thời điểm cập nhật cuối.
+    Dùng isoformat() giữ nguyên microsecond: cắt về giây nguyên sẽ làm hai
+    lần cập nhật trong cùng một giây cho ra cùng ETag, và conditional GET
+    trả 304 cho dữ liệu đã đổi.
+    """
+    return f"{todo.id}-{todo.updated_at.isoformat()}" if todo.updated_at else str(todo.id)
 
 @bp.route('/todos/<int:id>', methods=['GET'])
 def get_todo(id):
     """
     Lấy một công việc cụ thể bằng ID.
+    Hỗ trợ conditional GET: trả 304 Not Modified (không body) khi client
+    gửi If-None-Match trùng với ETag hiện tại — tiết kiệm toàn bộ chi phí
+    dump schema + encode JSON + truyền tải khi dữ liệu chưa đổi.
     Trả về thông tin của công việc hoặc lỗi 404 nếu không tìm thấy.
     """
-    try:
-        # Tìm công việc theo ID
-        todo = Todo.query.get(id)
-        if not todo:
-            # Trả về lỗi 404 Not Found nếu không tìm thấy công việc
-            return jsonify({"message": "Không tìm thấy công việc"}), 404
-        # Serialize công việc thành JSON
-        return jsonify(todo_schema.dump(todo)), 200
-    except Exception as e:
-        # Xử lý lỗi nếu có vấn đề khi truy vấn cơ sở dữ liệu
-        # Trả về lỗi 500 Internal Server Error
-        return jsonify({"message": f"Lỗi máy chủ nội bộ khi lấy công việc: {str(e)}"}), 500
+    # session.get tra identity map trước, chỉ phát SELECT khi cần
+    todo = db.session.get(Todo, id) or abort(404)
+
+    etag = _todo_etag(todo)
+    if request.if_none_match.contains_weak(etag):
+        # Client đã có bản mới nhất: bỏ qua serialize, trả 304 không body
+        response = current_app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+
+    # Serialize bằng to_dict viết tay (datetime thô, orjson encode thẳng),
+    # kèm ETag/Last-Modified cho lần sau
+    response = json_response(todo.to_dict(), 200)
+    response.set_etag(etag, weak=True)
+    response.last_modified = todo.updated_at
+    return response
 
 @bp.route('/todos', methods=['POST'])
 def add_todo():
@@ -53,39 +251,74 @@ def add_todo():
     Nhận dữ liệu JSON, validate và lưu vào cơ sở dữ liệu.
     Trả về công việc đã tạo với status 201 Created hoặc lỗi 400/500.
     """
-    try:
-        # Lấy dữ liệu JSON từ request
-        json_data = request.get_json()
-        if not json_data:
-            # Trả về lỗi 400 Bad Request nếu không có dữ liệu JSON
-            return jsonify({"message": "Dữ liệu JSON không được cung cấp"}), 400
-
-        # Validate và load dữ liệu bằng schema
-        # `load` sẽ trả về một dictionary đã được validate
-        validated_data = todo_schema.load(json_data)
-
-        # Tạo một đối tượng Todo mới
-        new_todo = Todo(
-            title=validated_data['title'],
-            description=validated_data.get('description'),
-            completed=validated_data.get('completed', False) # Mặc định là False nếu không có
-        )
-        
-        # Thêm vào session và commit vào cơ sở dữ liệu
-        db.session.add(new_todo)
-        db.session.commit()
-
-        # Serialize công việc mới và trả về với status 201 Created
-        return jsonify(todo_schema.dump(new_todo)), 201
-    except ValidationError as err:
-        # Xử lý lỗi validation từ Marshmallow
-        # Trả về lỗi 400 Bad Request với chi tiết lỗi
-        return jsonify({"message": "Dữ liệu đầu vào không hợp lệ", "errors": err.messages}), 400
-    except Exception as e:
-        # Xử lý lỗi cơ sở dữ liệu hoặc các lỗi khác
-        db.session.rollback() # Hoàn tác các thay đổi nếu có lỗi
-        # Trả về lỗi 500 Internal Server Error
-        return jsonify({"message": f"Lỗi máy chủ nội bộ khi thêm công việc: {str(e)}"}), 500
+    if msgspec is not None and current_app.config.get('FAST_VALIDATION', True):
+        # msgspec gộp parse JSON + validate + dựng object trong một lượt C,
+        # đọc thẳng body thô thay vì qua get_json rồi validate bằng Python
+        validated_data = decode_todo_payload(request.get_data(cache=False))
+    else:
+        # Validate dữ liệu đầu vào; trả về một dictionary đã được validate
+        validated_data = _load_todo_payload(get_json_or_400())
+
+    # Tạo một đối tượng Todo mới
+    new_todo = Todo(
+        title=validated_data['title'],
+        description=validated_data.get('description'),
+        completed=validated_data.get('completed', False) # Mặc định là False nếu không có
+    )
+
+    # Flush để phát INSERT và lấy id, rồi serialize TRƯỚC khi commit:
+    # commit mặc định expire instance, nên đọc thuộc tính sau commit sẽ
+    # phát thêm một câu SELECT refresh vô ích. Mọi giá trị còn lại
+    # (created_at, updated_at) là default phía Python, đã có sẵn từ flush.
+    db.session.add(new_todo)
+    db.session.flush()
+    payload = new_todo.to_dict()
+    db.session.commit()
+
+    # Trả về công việc mới với status 201 Created
+    return json_response(payload, 201)
+
+@bp.route('/todos/bulk', methods=['POST'])
+def add_todos_bulk():
+    """
+    Thêm nhiều công việc trong một request.
+    Nhận một danh sách JSON, validate từng phần tử rồi ghi tất cả bằng một
+    câu INSERT executemany trong một transaction duy nhất — một round-trip
+    tới database thay vì N lần add + flush từng dòng qua ORM.
+    Trả về {"created": n} với status 201, hoặc lỗi 400/500.
+    """
+    if msgspec is not None and current_app.config.get('FAST_VALIDATION', True):
+        # Parse + validate cả danh sách trong một lượt C (xem add_todo)
+        validated_list = decode_todo_payloads(request.get_data(cache=False))
+    else:
+        json_data = get_json_or_400()
+        if not isinstance(json_data, list):
+            # Endpoint này chỉ nhận một danh sách các công việc
+            abort(400, description="Cần cung cấp một danh sách JSON các công việc")
+        # Validate toàn bộ danh sách một lượt (lỗi gom theo chỉ số phần tử)
+        validated_list = _load_todo_payloads(json_data)
+
+    if not validated_list:
+        # Danh sách rỗng phải chặn TRƯỚC khi chạm database: executemany với
+        # tham số [] bị SQLAlchemy thực thi như một câu INSERT một dòng chỉ
+        # gồm giá trị default (IntegrityError trên title, hoặc tệ hơn là
+        # một dòng rác nếu cột nullable)
+        abort(400, description="Cần cung cấp ít nhất một công việc")
+
+    # Chuẩn hóa các dict về cùng một tập khóa để executemany dùng được
+    # một câu lệnh prepared duy nhất cho mọi dòng
+    rows = [
+        {
+            "title": d["title"],
+            "description": d.get("description"),
+            "completed": d.get("completed", False),
+        }
+        for d in validated_list
+    ]
+    # Một câu INSERT duy nhất cho cả lô (xem Todo.bulk_create)
+    created = Todo.bulk_create(rows)
+
+    return json_response({"created": created}, 201)
 
 @bp.route('/todos/<int:id>', methods=['PUT'])
 def update_todo(id):
@@ -94,45 +327,51 @@ def update_todo(id):
     Nhận dữ liệu JSON, validate và cập nhật công việc trong cơ sở dữ liệu.
     Trả về công việc đã cập nhật hoặc lỗi 400/404/500.
     """
-    try:
-        # Tìm công việc theo ID
-        todo = Todo.query.get(id)
-        if not todo:
-            # Trả về lỗi 404 Not Found nếu không tìm thấy công việc
-            return jsonify({"message": "Không tìm thấy công việc"}), 404
-
-        # Lấy dữ liệu JSON từ request
-        json_data = request.get_json()
-        if not json_data:
-            # Trả về lỗi 400 Bad Request nếu không có dữ liệu JSON
-            return jsonify({"message": "Dữ liệu JSON không được cung cấp"}), 400
-
-        # Validate và load dữ liệu bằng schema. partial=True cho phép cập nhật một phần
-        validated_data = todo_schema.load(json_data, partial=True)
-
-        # Cập nhật các trường của công việc nếu chúng tồn tại trong dữ liệu đã validate
-        if 'title' in validated_data:
-            todo.title = validated_data['title']
-        if 'description' in validated_data:
-            todo.description = validated_data['description']
-        if 'completed' in validated_data:
-            todo.completed = validated_data['completed']
-        
-        # Commit các thay đổi vào cơ sở dữ liệu
-        db.session.commit()
-
-        # Serialize công việc đã cập nhật và trả về
-        return jsonify(todo_schema.dump(todo)), 200
-    except ValidationError as err:
-        # Xử lý lỗi validation từ Marshmallow
-        db.session.rollback() # Hoàn tác các thay đổi nếu có lỗi
-        # Trả về lỗi 400 Bad Request với chi tiết lỗi
-        return jsonify({"message": "Dữ liệu đầu vào không hợp lệ", "errors": err.messages}), 400
-    except Exception as e:
-        # Xử lý lỗi cơ sở dữ liệu hoặc các lỗi khác
-        db.session.rollback() # Hoàn tác các thay đổi nếu có lỗi
-        # Trả về lỗi 500 Internal Server Error
-        return jsonify({"message": f"Lỗi máy chủ nội bộ khi cập nhật công việc: {str(e)}"}), 500
+    json_data = get_json_or_400()
+
+    # Validate theo kiểu partial: chỉ xét các trường có mặt trong body
+    validated_data = _load_todo_payload(json_data, partial=True)
+
+    values = {k: validated_data[k]
+              for k in ('title', 'description', 'completed') if k in validated_data}
+    if not values:
+        # Không có trường nào để cập nhật: chỉ cần trả về trạng thái hiện tại
+        row = db.session.execute(
+            select(Todo.id, Todo.title, Todo.description,
+                   Todo.completed, Todo.created_at, Todo.updated_at)
+            .where(Todo.id == id)
+        ).first() or abort(404)
+        # dict(zip(...)) + datetime thô: cùng một định dạng timestamp với
+        # POST/GET (orjson encode), không qua strftime của schema
+        return json_response(dict(zip(_ROW_KEYS, row)), 200)
+
+    # Một câu UPDATE ... RETURNING duy nhất thay cho SELECT rồi UPDATE:
+    # một round-trip tới database, không dựng instance ORM trung gian.
+    # onupdate của updated_at vẫn được áp dụng ở tầng Core.
+    # Điều kiện IS DISTINCT FROM biến PUT không-đổi-gì thành no-op ngay tại
+    # database: không ghi dòng nào, updated_at không bị đẩy lên vô cớ nên
+    # ETag của client vẫn còn hiệu lực. (Dùng is_distinct_from thay cho !=
+    # để so sánh đúng cả khi một vế là NULL, ví dụ description.)
+    changed = or_(*(getattr(Todo, k).is_distinct_from(v) for k, v in values.items()))
+    row = db.session.execute(
+        update(Todo).where(Todo.id == id, changed).values(**values)
+        .returning(Todo.id, Todo.title, Todo.description,
+                   Todo.completed, Todo.created_at, Todo.updated_at)
+    ).first()
+    if row is None:
+        # Không khớp dòng nào: hoặc id không tồn tại (404), hoặc giá trị
+        # gửi lên trùng hệt hiện trạng — khi đó trả trạng thái hiện tại,
+        # không commit gì cả
+        row = db.session.execute(
+            select(Todo.id, Todo.title, Todo.description,
+                   Todo.completed, Todo.created_at, Todo.updated_at)
+            .where(Todo.id == id)
+        ).first() or abort(404)
+        return json_response(dict(zip(_ROW_KEYS, row)), 200)
+    db.session.commit()
+
+    # Serialize công việc đã cập nhật và trả về (cùng đường với GET/POST)
+    return json_response(dict(zip(_ROW_KEYS, row)), 200)
 
 @bp.route('/todos/<int:id>', methods=['DELETE'])
 def delete_todo(id):
@@ -141,21 +380,12 @@ def delete_todo(id):
     Xóa công việc khỏi cơ sở dữ liệu.
     Trả về status 204 No Content nếu thành công hoặc lỗi 404/500.
     """
-    try:
-        # Tìm công việc theo ID
-        todo = Todo.query.get(id)
-        if not todo:
-            # Trả về lỗi 404 Not Found nếu không tìm thấy công việc
-            return jsonify({"message": "Không tìm thấy công việc"}), 404
-
-        # Xóa công việc khỏi session và commit
-        db.session.delete(todo)
-        db.session.commit()
-
-        # Trả về phản hồi rỗng với status 204 No Content (đã xóa thành công)
-        return '', 204
-    except Exception as e:
-        # Xử lý lỗi cơ sở dữ liệu
-        db.session.rollback() # Hoàn tác các thay đổi nếu có lỗi
-        # Trả về lỗi 500 Internal Server Error
-        return jsonify({"message": f"Lỗi máy chủ nội bộ khi xóa công việc: {str(e)}"}), 500
+    # Một câu DELETE duy nhất thay cho SELECT rồi DELETE: rowcount cho biết
+    # ngay bản ghi có tồn tại không, khỏi dựng instance ORM chỉ để vứt đi.
+    result = db.session.execute(delete(Todo).where(Todo.id == id))
+    if result.rowcount == 0:
+        abort(404)
+    db.session.commit()
+
+    # Trả về phản hồi rỗng với status 204 No Content (đã xóa thành công)
+    return '', 204
@@ -0,0 +1,134 @@
+from typing import Annotated, Optional
+
+from marshmallow import ValidationError
+
+# Validator chuyên biệt cho payload Todo, thay cho đường load() tổng quát
+# của Marshmallow trên các endpoint ghi. Schema chỉ có 3 trường ghi được
+# (title, description, completed) nên vài phép isinstance/len là đủ —
+# bỏ qua toàn bộ tầng dispatch _deserialize/_validate_all của Marshmallow.
+# Ném ValidationError với cùng cấu trúc {field: [msg]} để handler 400
+# hiện có dùng lại được nguyên vẹn.
+
+# Giới hạn độ dài khớp với định nghĩa cột trong app.models.Todo
+_TITLE_MAX = 120
+_DESCRIPTION_MAX = 255
+
+try:
+    # Ưu tiên msgspec khi có: parse JSON + validate + dựng object gộp thành
+    # một lượt chạy trong C, nhanh hơn hẳn đường get_json rồi validate từng
+    # trường bằng Python. Chỉ dùng cho payload đầy đủ (POST) — với PUT
+    # partial không phân biệt được "trường vắng mặt" và "giá trị mặc định"
+    # của Struct, nên PUT vẫn đi qua validate_todo_payload.
+    import msgspec
+
+    class TodoIn(msgspec.Struct):
+        title: Annotated[str, msgspec.Meta(min_length=1, max_length=_TITLE_MAX)]
+        description: Optional[Annotated[str, msgspec.Meta(max_length=_DESCRIPTION_MAX)]] = None
+        completed: bool = False
+
+    _todo_decoder = msgspec.json.Decoder(TodoIn)
+    _todos_decoder = msgspec.json.Decoder(list[TodoIn])
+except ImportError:
+    msgspec = None
+    _todo_decoder = _todos_decoder = None
+
+
+def _todo_in_to_dict(obj):
+    return {"title": obj.title, "description": obj.description, "completed": obj.completed}
+
+
+def decode_todo_payload(raw):
+    """
+    Decode + validate body JSON (bytes) của một Todo bằng msgspec.
+    Trả về dict cùng cấu trúc với validate_todo_payload; lỗi được quy về
+    ValidationError để handler 400 hiện có xử lý. Chỉ gọi khi msgspec có mặt.
+    """
+    try:
+        return _todo_in_to_dict(_todo_decoder.decode(raw))
+    except msgspec.ValidationError as err:
+        raise ValidationError({"_schema": [str(err)]})
+    except msgspec.DecodeError:
+        raise ValidationError({"_schema": ["Dữ liệu JSON không hợp lệ"]})
+
+
+def decode_todo_payloads(raw):
+    """Bản danh sách của decode_todo_payload, cho endpoint bulk."""
+    try:
+        return [_todo_in_to_dict(obj) for obj in _todos_decoder.decode(raw)]
+    except msgspec.ValidationError as err:
+        raise ValidationError({"_schema": [str(err)]})
+    except msgspec.DecodeError:
+        raise ValidationError({"_schema": ["Dữ liệu JSON không hợp lệ"]})
+
+
+def validate_todo_payload(data, partial=False):
+    """
+    Validate một dict payload Todo và trả về dict đã chuẩn hóa.
+
+    Args:
+        data: dict từ body JSON của request.
+        partial: True cho PUT — chỉ validate các trường có mặt,
+                 không bắt buộc title và không điền mặc định.
+
+    Returns:
+        dict chỉ gồm các khóa hợp lệ ('title', 'description', 'completed').
+
+    Raises:
+        ValidationError: với messages dạng {tên_trường: [thông báo]}.
+    """
+    if not isinstance(data, dict):
+        raise ValidationError({"_schema": ["Dữ liệu không hợp lệ, cần một đối tượng JSON"]})
+
+    errors = {}
+    out = {}
+
+    if 'title' in data:
+        title = data['title']
+        if not isinstance(title, str) or not 1 <= len(title) <= _TITLE_MAX:
+            errors['title'] = [f"Tiêu đề phải là chuỗi từ 1 đến {_TITLE_MAX} ký tự"]
+        else:
+            out['title'] = title
+    elif not partial:
+        errors['title'] = ["Thiếu trường bắt buộc"]
+
+    if 'description' in data:
+        description = data['description']
+        if description is not None and (
+                not isinstance(description, str) or len(description) > _DESCRIPTION_MAX):
+            errors['description'] = [f"Mô tả phải là chuỗi tối đa {_DESCRIPTION_MAX} ký tự"]
+        else:
+            out['description'] = description
+
+    if 'completed' in data:
+        completed = data['completed']
+        if not isinstance(completed, bool):
+            errors['completed'] = ["Trạng thái hoàn thành phải là true/false"]
+        else:
+            out['completed'] = completed
+    elif not partial:
+        out['completed'] = False
+
+    if errors:
+        raise ValidationError(errors)
+    return out
+
+
+def validate_todo_payloads(data):
+    """
+    Validate một danh sách payload Todo (cho endpoint bulk).
+    Lỗi được gom theo chỉ số phần tử, cùng cấu trúc với load(many=True)
+    của Marshmallow: {chỉ_số: {tên_trường: [thông báo]}}.
+    """
+    if not isinstance(data, list):
+        raise ValidationError({"_schema": ["Dữ liệu không hợp lệ, cần một danh sách JSON"]})
+
+    errors = {}
+    out = []
+    for index, item in enumerate(data):
+        try:
+            out.append(validate_todo_payload(item))
+        except ValidationError as err:
+            errors[index] = err.messages
+    if errors:
+        raise ValidationError(errors)
+    return out